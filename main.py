@@ -9,22 +9,26 @@ Features:
 """
 import os
 import json
+import logging
 import re
 import shutil
 import asyncio
 import math
 import uuid
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response, FileResponse
 from fastapi.staticfiles import StaticFiles
+from pydantic import TypeAdapter, ValidationError
 
 from models.video_process import (
     TextOverlay,
     LogoOverlay,
+    TextOverlayList,
+    LogoOverlayList,
 )
 from services.video_processor import (
     get_video_info,
@@ -35,8 +39,11 @@ from services.video_processor import (
     extract_audio,
     generate_gif,
     cleanup_file,
+    cleanup_files_async,
     is_ffmpeg_installed,
     is_ffprobe_installed,
+    get_ffmpeg_path,
+    get_ffprobe_path,
     VideoProcessingError,
     create_video_from_images,
 )
@@ -44,7 +51,8 @@ from services.video_deleter import delete_frame_from_video
 from services.speech_generator import generate_ai_speech
 
 from services.background_remover import (
-    remove_background,
+    remove_background_async,
+    warm_up as warm_up_background_remover,
     BackgroundRemovalError,
 )
 from services.image_enhancer import (
@@ -55,29 +63,57 @@ from services.image_enhancer import (
 
 app = FastAPI(title="Flarelap FastAPI Server", version="1.0.0")
 
-# CORS middleware
+
+def _env_list(name: str, default: str) -> List[str]:
+    return [item.strip() for item in os.environ.get(name, default).split(",") if item.strip()]
+
+
+# CORS middleware (set CORS_ALLOW_ORIGINS / CORS_ALLOW_HEADERS to comma-separated lists in production)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=_env_list("CORS_ALLOW_ORIGINS", "*"),
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=_env_list("CORS_ALLOW_HEADERS", "*"),
 )
 
 # Configuration
-UPLOAD_DIR = "uploads"
+# Point UPLOAD_DIR at a tmpfs mount (e.g. /dev/shm/uploads) to keep transient uploads in RAM
+UPLOAD_DIR = os.environ.get("UPLOAD_DIR", "uploads")
 OUTPUT_DIR = "outputs"
 DEBUG_MODE = os.environ.get("DEBUG_KEEP_UPLOADS", "false").lower() == "true"
+VERBOSE_LOGGING = os.environ.get("DEBUG_VERBOSE", "false").lower() == "true"
+REMBG_WARMUP = os.environ.get("REMBG_WARMUP", "true").lower() == "true"
 FORCE_LOGGING = True
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+OUTPUT_CHUNK_SIZE = 1024 * 1024
+
+_LOGO_FIELD_RE = re.compile(r"^logo_(\d+)$")
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^A-Za-z0-9._-]+")
 
 # Create directories
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
-def log_debug(message: str, data: any = None):
-    """Debug logging helper"""
-    print(f"[VIDEO-DEBUG] {message}", data if data else "")
+class _OutputFileResponse(FileResponse):
+    """FileResponse that streams rendered outputs in 1 MiB chunks instead of Starlette's 64 KiB."""
+    chunk_size = OUTPUT_CHUNK_SIZE
+
+
+def _configure_logger() -> logging.Logger:
+    """Video debug logger; messages are only formatted when DEBUG is enabled."""
+    video_logger = logging.getLogger("video")
+    if not video_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("[VIDEO-%(levelname)s] %(message)s"))
+        video_logger.addHandler(handler)
+    video_logger.setLevel(logging.DEBUG if DEBUG_MODE or VERBOSE_LOGGING else logging.WARNING)
+    video_logger.propagate = False
+    return video_logger
+
+
+logger = _configure_logger()
 
 
 def should_keep_file() -> bool:
@@ -89,9 +125,23 @@ def _is_upload_file(value: Any) -> bool:
     return hasattr(value, "filename") and hasattr(value, "read")
 
 
+def _copy_upload(source: Any, dest: str) -> None:
+    with open(dest, "wb") as f:
+        shutil.copyfileobj(source, f, UPLOAD_CHUNK_SIZE)
+
+
+async def _save_upload(upload: Any, dest: str) -> None:
+    """
+    Stream an uploaded file to disk in fixed-size chunks instead of one large read.
+    The copy runs in a worker thread so the event loop keeps serving other requests.
+    """
+    await upload.seek(0)
+    await asyncio.to_thread(_copy_upload, upload.file, dest)
+
+
 def _safe_filename(filename: Optional[str], fallback: str) -> str:
     base = Path(filename or fallback).name
-    sanitized = re.sub(r"[^A-Za-z0-9._-]+", "_", base).strip("._")
+    sanitized = _UNSAFE_FILENAME_CHARS_RE.sub("_", base).strip("._")
     return sanitized or fallback
 
 
@@ -139,6 +189,26 @@ def _parse_json_array(form_data: Dict[str, Any], key: str) -> List[Any]:
     return parsed
 
 
+def _parse_overlays(form_data: Dict[str, Any], key: str, adapter: TypeAdapter) -> List[Any]:
+    raw = form_data.get(key, "[]")
+    if raw in (None, ""):
+        return []
+    try:
+        return adapter.validate_json(raw)
+    except ValidationError as exc:
+        error = exc.errors()[0]
+        loc = error.get("loc") or ()
+        if error.get("type") == "json_invalid":
+            detail = (error.get("ctx") or {}).get("error", error.get("msg"))
+            raise HTTPException(status_code=400, detail=f"Invalid JSON in '{key}': {detail}")
+        if not loc:
+            raise HTTPException(status_code=400, detail=f"'{key}' must be a JSON array")
+        if len(loc) == 1 and error.get("type") == "model_type":
+            raise HTTPException(status_code=400, detail=f"{key}[{loc[0]}] must be an object")
+        field = ".".join(str(part) for part in loc[1:])
+        raise HTTPException(status_code=400, detail=f"Invalid {key}[{loc[0]}]: {field}: {error.get('msg')}")
+
+
 def _parse_merge_clips(form_data: Dict[str, Any]) -> List[Dict[str, Any]]:
     raw = form_data.get("mergeClips", "[]")
     if raw in (None, ""):
@@ -210,9 +280,7 @@ async def _save_uploaded_music_tracks(
         track_path = os.path.join(UPLOAD_DIR, f"{file_key}_{uuid.uuid4().hex}_{safe_name}")
         temp_files_to_cleanup.append(track_path)
 
-        with open(track_path, "wb") as f:
-            content = await music_upload.read()
-            f.write(content)
+        await _save_upload(music_upload, track_path)
 
         track_start = _parse_form_float(item, "startTime", 0.0, minimum=0.0)
         track_end = _parse_form_float(item, "endTime", None, minimum=0.0, allow_none=True)
@@ -234,6 +302,17 @@ async def _save_uploaded_music_tracks(
 app.mount("/outputs", StaticFiles(directory=OUTPUT_DIR), name="outputs")
 
 
+@app.on_event("startup")
+async def warm_up_models():
+    """Load the background removal model before serving the first request."""
+    if not REMBG_WARMUP:
+        return
+    try:
+        await warm_up_background_remover()
+    except Exception as e:
+        logger.warning("Background removal warm-up failed: %s", e)
+
+
 @app.get("/")
 def root():
     return {"message": "Welcome to FastAPI Server"}
@@ -250,19 +329,19 @@ async def check_ffmpeg():
     Check if FFmpeg and FFprobe are installed on the system.
     Required for video processing functionality.
     """
-    ffmpeg_ok = is_ffmpeg_installed()
-    ffprobe_ok = is_ffprobe_installed()
+    ffmpeg_path = get_ffmpeg_path()
+    ffprobe_path = get_ffprobe_path()
     
     return {
         "ffmpeg": {
-            "installed": ffmpeg_ok,
-            "path": shutil.which("ffmpeg") if ffmpeg_ok else None
+            "installed": ffmpeg_path is not None,
+            "path": ffmpeg_path
         },
         "ffprobe": {
-            "installed": ffprobe_ok,
-            "path": shutil.which("ffprobe") if ffprobe_ok else None
+            "installed": ffprobe_path is not None,
+            "path": ffprobe_path
         },
-        "video_processing_available": ffmpeg_ok and ffprobe_ok
+        "video_processing_available": ffmpeg_path is not None and ffprobe_path is not None
     }
 
 
@@ -279,7 +358,7 @@ async def remove_bg_endpoint(file: UploadFile = File(...)):
     """
     try:
         input_image = await file.read()
-        output_image = remove_background(input_image)
+        output_image = await remove_background_async(input_image)
         return Response(content=output_image, media_type="image/png")
     except BackgroundRemovalError as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -330,11 +409,9 @@ async def get_video_metadata(video: UploadFile = File(...)):
     safe_video_name = _safe_filename(video.filename, "video.mp4")
     temp_video_path = os.path.join(UPLOAD_DIR, f"info_{uuid.uuid4().hex}_{safe_video_name}")
     try:
-        with open(temp_video_path, "wb") as f:
-            content = await video.read()
-            f.write(content)
+        await _save_upload(video, temp_video_path)
         
-        log_debug(f"Video file saved for info extraction: {temp_video_path}")
+        logger.debug("Video file saved for info extraction: %s", temp_video_path)
         info = await get_video_info(temp_video_path)
         return info
         
@@ -344,7 +421,7 @@ async def get_video_metadata(video: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Failed to process video: {str(e)}")
     finally:
         if not should_keep_file():
-            cleanup_file(temp_video_path)
+            await cleanup_files_async([temp_video_path])
 
 
 @app.post("/video/compress")
@@ -376,9 +453,7 @@ async def compress_video_endpoint(request: Request, background_tasks: Background
     trim_duration = _parse_form_float(form_data, "trimDuration", None, minimum=0.1, allow_none=True)
     
     try:
-        with open(temp_video_path, "wb") as f:
-            content = await video_file.read()
-            f.write(content)
+        await _save_upload(video_file, temp_video_path)
         
         output_path = os.path.join(OUTPUT_DIR, f"compressed_{Path(safe_video_name).stem}_{uuid.uuid4().hex}.mp4")
         
@@ -393,14 +468,13 @@ async def compress_video_endpoint(request: Request, background_tasks: Background
             raise HTTPException(status_code=500, detail="Compression failed")
         
         background_tasks.add_task(cleanup_file, output_path)
-        return FileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
+        return _OutputFileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if not should_keep_file():
-            for f in temp_files:
-                cleanup_file(f)
+            await cleanup_files_async(temp_files)
 
 
 @app.post("/video/audio")
@@ -428,9 +502,7 @@ async def extract_audio_endpoint(request: Request, background_tasks: BackgroundT
     temp_files = [temp_video_path]
     
     try:
-        with open(temp_video_path, "wb") as f:
-            content = await video_file.read()
-            f.write(content)
+        await _save_upload(video_file, temp_video_path)
         
         output_path = os.path.join(OUTPUT_DIR, f"{Path(safe_video_name).stem}_audio_{uuid.uuid4().hex}.m4a")
         
@@ -440,14 +512,13 @@ async def extract_audio_endpoint(request: Request, background_tasks: BackgroundT
             raise HTTPException(status_code=500, detail="Audio extraction failed")
         
         background_tasks.add_task(cleanup_file, output_path)
-        return FileResponse(path=output_path, media_type="audio/mp4", filename=Path(output_path).name)
+        return _OutputFileResponse(path=output_path, media_type="audio/mp4", filename=Path(output_path).name)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if not should_keep_file():
-            for f in temp_files:
-                cleanup_file(f)
+            await cleanup_files_async(temp_files)
 
 
 @app.post("/video/gif")
@@ -479,9 +550,7 @@ async def generate_gif_endpoint(request: Request, background_tasks: BackgroundTa
     gif_width = int(_parse_form_float(form_data, "width", 640, minimum=320, maximum=1280) or 640)
     
     try:
-        with open(temp_video_path, "wb") as f:
-            content = await video_file.read()
-            f.write(content)
+        await _save_upload(video_file, temp_video_path)
         
         output_path = os.path.join(OUTPUT_DIR, f"{Path(safe_video_name).stem}_gif_{uuid.uuid4().hex}.gif")
         
@@ -497,14 +566,13 @@ async def generate_gif_endpoint(request: Request, background_tasks: BackgroundTa
             raise HTTPException(status_code=500, detail="GIF generation failed")
         
         background_tasks.add_task(cleanup_file, output_path)
-        return FileResponse(path=output_path, media_type="image/gif", filename=Path(output_path).name)
+        return _OutputFileResponse(path=output_path, media_type="image/gif", filename=Path(output_path).name)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if not should_keep_file():
-            for f in temp_files:
-                cleanup_file(f)
+            await cleanup_files_async(temp_files)
 
 
 @app.post("/video/merge")
@@ -555,9 +623,7 @@ async def merge_video_endpoint(request: Request, background_tasks: BackgroundTas
         safe_clip_name = _safe_filename(getattr(clip_upload, "filename", None), f"clip_{index}.mp4")
         clip_path = os.path.join(UPLOAD_DIR, f"mergeclip_{index}_{uuid.uuid4().hex}_{safe_clip_name}")
         temp_files_to_cleanup.append(clip_path)
-        with open(clip_path, "wb") as f:
-            content = await clip_upload.read()
-            f.write(content)
+        await _save_upload(clip_upload, clip_path)
 
         position = clip["position"]
         insert_time = clip.get("insertTime")
@@ -572,9 +638,7 @@ async def merge_video_endpoint(request: Request, background_tasks: BackgroundTas
         })
 
     try:
-        with open(temp_video_path, "wb") as f:
-            content = await video_file.read()
-            f.write(content)
+        await _save_upload(video_file, temp_video_path)
 
         output_path = os.path.join(OUTPUT_DIR, f"merged_{Path(safe_video_name).stem}_{uuid.uuid4().hex}.mp4")
 
@@ -589,7 +653,7 @@ async def merge_video_endpoint(request: Request, background_tasks: BackgroundTas
             raise HTTPException(status_code=500, detail="Video merge failed")
 
         background_tasks.add_task(cleanup_file, output_path)
-        return FileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
+        return _OutputFileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
 
     except HTTPException:
         raise
@@ -599,8 +663,7 @@ async def merge_video_endpoint(request: Request, background_tasks: BackgroundTas
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if not should_keep_file():
-            for f in temp_files_to_cleanup:
-                cleanup_file(f)
+            await cleanup_files_async(temp_files_to_cleanup)
 
 
 @app.post("/video/merge-audio")
@@ -640,9 +703,7 @@ async def merge_audio_endpoint(request: Request, background_tasks: BackgroundTas
         if not parsed_music_tracks:
             raise HTTPException(status_code=400, detail="No valid uploaded music track files found")
 
-        with open(temp_video_path, "wb") as f:
-            content = await video_file.read()
-            f.write(content)
+        await _save_upload(video_file, temp_video_path)
 
         output_path = os.path.join(OUTPUT_DIR, f"audio_merged_{Path(safe_video_name).stem}_{uuid.uuid4().hex}.mp4")
 
@@ -671,7 +732,7 @@ async def merge_audio_endpoint(request: Request, background_tasks: BackgroundTas
             raise HTTPException(status_code=500, detail="Audio merge failed")
 
         background_tasks.add_task(cleanup_file, output_path)
-        return FileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
+        return _OutputFileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
 
     except HTTPException:
         raise
@@ -681,8 +742,7 @@ async def merge_audio_endpoint(request: Request, background_tasks: BackgroundTas
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if not should_keep_file():
-            for f in temp_files_to_cleanup:
-                cleanup_file(f)
+            await cleanup_files_async(temp_files_to_cleanup)
 
 
 @app.post("/audio/merge")
@@ -726,7 +786,7 @@ async def merge_audio_files_endpoint(request: Request, background_tasks: Backgro
             raise HTTPException(status_code=500, detail="Audio merge failed")
 
         background_tasks.add_task(cleanup_file, output_path)
-        return FileResponse(path=output_path, media_type="audio/mp4", filename=Path(output_path).name)
+        return _OutputFileResponse(path=output_path, media_type="audio/mp4", filename=Path(output_path).name)
 
     except HTTPException:
         raise
@@ -736,8 +796,7 @@ async def merge_audio_files_endpoint(request: Request, background_tasks: Backgro
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if not should_keep_file():
-            for f in temp_files_to_cleanup:
-                cleanup_file(f)
+            await cleanup_files_async(temp_files_to_cleanup)
 
 
 @app.post("/video/process")
@@ -749,33 +808,39 @@ async def process_video_endpoint(request: Request, background_tasks: BackgroundT
     if not is_ffmpeg_installed():
         raise HTTPException(status_code=500, detail="FFmpeg is not installed")
 
-    log_debug("=" * 60)
-    log_debug("VIDEO PROCESS ENDPOINT")
-    log_debug("=" * 60)
+    logger.debug("VIDEO PROCESS ENDPOINT")
 
     # Parse multipart form data manually
     form_data = await request.form()
 
-    log_debug(f"Form data keys: {list(form_data.keys())}")
+    logger.debug("Form data keys: %s", list(form_data.keys()))
+
+    # Single pass over the form: collect logo uploads (logo_0, logo_1, ...) and the
+    # first non-logo/non-music file as the fallback video.
+    fallback_video_file = None
+    logo_uploads: List[Tuple[int, Any]] = []
     for key, value in form_data.items():
-        log_debug(f"Key: {key}, Type: {type(value)}, Filename: {getattr(value, 'filename', None)}")
+        logger.debug("Key: %s, Type: %s, Filename: %s", key, type(value), getattr(value, "filename", None))
+        if not _is_upload_file(value):
+            continue
+        logo_match = _LOGO_FIELD_RE.match(key)
+        if logo_match:
+            logo_uploads.append((int(logo_match.group(1)), value))
+        elif fallback_video_file is None and not key.startswith('logo_') and key != 'music' and not key.startswith('music_'):
+            fallback_video_file = value
 
     # Video file: prefer explicit "video" key, then fallback to first non-logo/non-music file
     video_file = form_data.get("video")
     video_filename = getattr(video_file, "filename", None) if video_file else None
     if not video_filename:
-        video_file = None
-        for key, value in form_data.items():
-            if _is_upload_file(value) and not key.startswith('logo_') and key != 'music' and not key.startswith('music_'):
-                video_file = value
-                video_filename = value.filename
-                break
+        video_file = fallback_video_file
+        video_filename = getattr(video_file, "filename", None) if video_file else None
 
     if not video_file:
-        log_debug("No video file found!")
+        logger.debug("No video file found!")
         raise HTTPException(status_code=400, detail="No video file found in request")
 
-    log_debug(f"Video file: {video_filename}")
+    logger.debug("Video file: %s", video_filename)
 
     # Get other parameters
     trim_start = _parse_form_float(form_data, "trimStart", 0.0, minimum=0.0)
@@ -792,48 +857,22 @@ async def process_video_endpoint(request: Request, background_tasks: BackgroundT
         music_end = music_start
 
     # Parse overlays
-    text_overlays_raw = _parse_json_array(form_data, "textOverlays")
-    logo_overlays_raw = _parse_json_array(form_data, "logoOverlays")
-
-    text_overlays: List[TextOverlay] = []
-    for index, item in enumerate(text_overlays_raw):
-        if not isinstance(item, dict):
-            raise HTTPException(status_code=400, detail=f"textOverlays[{index}] must be an object")
-        try:
-            text_overlays.append(TextOverlay(**item))
-        except Exception as exc:
-            raise HTTPException(status_code=400, detail=f"Invalid textOverlays[{index}]: {str(exc)}")
-
-    logo_overlays: List[LogoOverlay] = []
-    for index, item in enumerate(logo_overlays_raw):
-        if not isinstance(item, dict):
-            raise HTTPException(status_code=400, detail=f"logoOverlays[{index}] must be an object")
-        try:
-            logo_overlays.append(LogoOverlay(**item))
-        except Exception as exc:
-            raise HTTPException(status_code=400, detail=f"Invalid logoOverlays[{index}]: {str(exc)}")
+    text_overlays: List[TextOverlay] = _parse_overlays(form_data, "textOverlays", TextOverlayList)
+    logo_overlays: List[LogoOverlay] = _parse_overlays(form_data, "logoOverlays", LogoOverlayList)
 
-    log_debug(f"Text overlays: {len(text_overlays)}")
-    log_debug(f"Logo overlays: {len(logo_overlays)}")
+    logger.debug("Text overlays: %d", len(text_overlays))
+    logger.debug("Logo overlays: %d", len(logo_overlays))
 
     # Find logo files (logo_0, logo_1, etc.)
     logo_files_by_filename: Dict[str, str] = {}
     logo_files_by_index: Dict[int, str] = {}
     saved_logo_paths: List[str] = []
+    logo_saves = []
 
-    for key, value in form_data.items():
-        if not (_is_upload_file(value) and key.startswith("logo_")):
-            continue
-        match = re.match(r"^logo_(\d+)$", key)
-        if not match:
-            continue
-
-        idx = int(match.group(1))
+    for idx, value in logo_uploads:
         safe_logo_name = _safe_filename(getattr(value, "filename", None), f"logo_{idx}.png")
         logo_path = os.path.join(UPLOAD_DIR, f"logo_{idx}_{uuid.uuid4().hex}_{safe_logo_name}")
-        with open(logo_path, "wb") as f:
-            content = await value.read()
-            f.write(content)
+        logo_saves.append(_save_upload(value, logo_path))
 
         logo_files_by_index[idx] = logo_path
         saved_logo_paths.append(logo_path)
@@ -844,13 +883,20 @@ async def process_video_endpoint(request: Request, background_tasks: BackgroundT
             overlay_config = json.loads(overlay_config_str)
         except json.JSONDecodeError:
             overlay_config = {}
-            log_debug(f"Failed to parse {overlay_key}")
+            logger.debug("Failed to parse %s", overlay_key)
 
         if isinstance(overlay_config, dict):
             filename_key = overlay_config.get("filename")
             if isinstance(filename_key, str) and filename_key:
                 logo_files_by_filename[filename_key] = logo_path
-                log_debug(f"Saved logo: {logo_path} -> {filename_key}")
+                logger.debug("Saved logo: %s -> %s", logo_path, filename_key)
+
+    # Write all logo uploads concurrently; on failure drop whatever was written.
+    save_results = await asyncio.gather(*logo_saves, return_exceptions=True)
+    save_error = next((result for result in save_results if isinstance(result, BaseException)), None)
+    if save_error is not None:
+        await cleanup_files_async(saved_logo_paths)
+        raise HTTPException(status_code=500, detail=f"Failed to save logo upload: {str(save_error)}")
 
     logo_file_sequence: List[Optional[str]] = []
     for index, overlay in enumerate(logo_overlays):
@@ -858,11 +904,11 @@ async def process_video_endpoint(request: Request, background_tasks: BackgroundT
             logo_files_by_index.get(index) or logo_files_by_filename.get(overlay.filename)
         )
 
-    log_debug(f"Logo files found by index: {logo_files_by_index}")
-    log_debug(f"Logo files found by filename: {logo_files_by_filename}")
+    logger.debug("Logo files found by index: %s", logo_files_by_index)
+    logger.debug("Logo files found by filename: %s", logo_files_by_filename)
 
     if len(logo_overlays) > 0 and not any(logo_file_sequence):
-        log_debug("Warning: Logo overlays present but no logo files found!")
+        logger.warning("Logo overlays present but no logo files found")
 
     # Save video and optional music track
     safe_video_name = _safe_filename(video_filename, "video.mp4")
@@ -878,19 +924,14 @@ async def process_video_endpoint(request: Request, background_tasks: BackgroundT
     parsed_music_tracks = await _save_uploaded_music_tracks(form_data, music_tracks_raw, temp_files_to_cleanup)
 
     try:
-        with open(temp_video_path, "wb") as f:
-            content = await video_file.read()
-            f.write(content)
+        await _save_upload(video_file, temp_video_path)
 
         if music_file_path and music_file:
-            with open(music_file_path, "wb") as f:
-                content = await music_file.read()
-                f.write(content)
+            await _save_upload(music_file, music_file_path)
 
         output_path = os.path.join(OUTPUT_DIR, f"processed_{Path(safe_video_name).stem}_{uuid.uuid4().hex}.mp4")
 
-        log_debug(f"Starting FFmpeg processing...")
-        log_debug(f"Output path: {output_path}")
+        logger.debug("Starting FFmpeg processing, output path: %s", output_path)
 
         success = await process_video(
             input_path=temp_video_path,
@@ -916,22 +957,21 @@ async def process_video_endpoint(request: Request, background_tasks: BackgroundT
         if not success:
             raise HTTPException(status_code=500, detail="Video processing failed")
 
-        log_debug(f"SUCCESS: Video processed -> {output_path}")
+        logger.debug("SUCCESS: Video processed -> %s", output_path)
 
         # Schedule cleanup of output file after response is sent
         background_tasks.add_task(cleanup_file, output_path)
 
-        return FileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
+        return _OutputFileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
 
     except HTTPException:
         raise
     except Exception as e:
-        log_debug(f"ERROR: {e}")
+        logger.error("Video processing failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if not should_keep_file():
-            for f in temp_files_to_cleanup:
-                cleanup_file(f)
+            await cleanup_files_async(temp_files_to_cleanup)
 
 @app.post("/video/delete-frame")
 async def delete_frame_endpoint(request: Request, background_tasks: BackgroundTasks):
@@ -959,9 +999,7 @@ async def delete_frame_endpoint(request: Request, background_tasks: BackgroundTa
     temp_files = [temp_video_path]
     
     try:
-        with open(temp_video_path, "wb") as f:
-            content = await video_file.read()
-            f.write(content)
+        await _save_upload(video_file, temp_video_path)
         
         output_path = os.path.join(OUTPUT_DIR, f"{Path(safe_video_name).stem}_frame_deleted_{uuid.uuid4().hex}.mp4")
         
@@ -974,14 +1012,13 @@ async def delete_frame_endpoint(request: Request, background_tasks: BackgroundTa
         )
         
         background_tasks.add_task(cleanup_file, output_path)
-        return FileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
+        return _OutputFileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if not should_keep_file():
-            for f in temp_files:
-                cleanup_file(f)
+            await cleanup_files_async(temp_files)
 
 
 @app.post("/video/create-from-images")
@@ -997,9 +1034,7 @@ async def create_video_from_images_endpoint(
     if not is_ffmpeg_installed():
         raise HTTPException(status_code=500, detail="FFmpeg is not installed")
 
-    log_debug("=" * 60)
-    log_debug("CREATE VIDEO FROM IMAGES ENDPOINT")
-    log_debug("=" * 60)
+    logger.debug("CREATE VIDEO FROM IMAGES ENDPOINT")
 
     try:
         durations_list = json.loads(durations)
@@ -1045,9 +1080,7 @@ async def create_video_from_images_endpoint(
         for idx, img_file in enumerate(images):
             safe_name = _safe_filename(img_file.filename, f"image_{idx}.png")
             image_path = os.path.join(UPLOAD_DIR, f"slideshow_img_{idx}_{uuid.uuid4().hex}_{safe_name}")
-            with open(image_path, "wb") as f:
-                content = await img_file.read()
-                f.write(content)
+            await _save_upload(img_file, image_path)
             saved_image_paths.append(image_path)
 
         output_path = os.path.join(OUTPUT_DIR, f"slideshow_{uuid.uuid4().hex}.mp4")
@@ -1062,21 +1095,20 @@ async def create_video_from_images_endpoint(
         if not success:
             raise HTTPException(status_code=500, detail="Failed to generate video from images")
 
-        log_debug(f"SUCCESS: Slideshow video created -> {output_path}")
+        logger.debug("SUCCESS: Slideshow video created -> %s", output_path)
 
         background_tasks.add_task(cleanup_file, output_path)
 
-        return FileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
+        return _OutputFileResponse(path=output_path, media_type="video/mp4", filename=Path(output_path).name)
 
     except HTTPException:
         raise
     except Exception as e:
-        log_debug(f"ERROR creating slideshow: {e}")
+        logger.error("Slideshow creation failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
         if not should_keep_file():
-            for f in saved_image_paths:
-                cleanup_file(f)
+            await cleanup_files_async(saved_image_paths)
 
 
 @app.post("/audio/generate-speech")
@@ -1088,9 +1120,7 @@ async def generate_speech_endpoint(
     """
     Generate customized speech voiceover from text using Google Text-to-Speech (gTTS).
     """
-    log_debug("=" * 60)
-    log_debug(f"GENERATE SPEECH ENDPOINT | Text: '{text[:50]}...' | Lang: {lang}")
-    log_debug("=" * 60)
+    logger.debug("GENERATE SPEECH ENDPOINT | Text: '%s...' | Lang: %s", text[:50], lang)
 
     if not text or not text.strip():
         raise HTTPException(status_code=400, detail="Text string cannot be empty")
@@ -1111,14 +1141,14 @@ async def generate_speech_endpoint(
         # Clean up output file after response is sent
         background_tasks.add_task(cleanup_file, output_path)
 
-        return FileResponse(
+        return _OutputFileResponse(
             path=output_path,
             media_type="audio/mpeg",
             filename=output_filename
         )
 
     except Exception as e:
-        log_debug(f"ERROR in AI speech generation: {e}")
+        logger.error("AI speech generation failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -2,7 +2,7 @@
 Pydantic models for video processing API.
 Defines request/response schemas for video trim, adjust, and overlay operations.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import Optional, List, Any
 from enum import Enum
 
@@ -41,6 +41,12 @@ class LogoOverlay(BaseModel):
         populate_by_name = True
 
 
+# Validators for the JSON-encoded overlay arrays sent as form fields. validate_json parses
+# and validates in pydantic-core, without an intermediate json.loads pass.
+TextOverlayList = TypeAdapter(List[TextOverlay])
+LogoOverlayList = TypeAdapter(List[LogoOverlay])
+
+
 class VideoTrimParams(BaseModel):
     """Video trimming parameters"""
     trimStart: float = Field(default=0.0, ge=0, description="Start time for trimming in seconds")
@@ -2,6 +2,13 @@
 Background removal service using rembg.
 Provides functions for removing backgrounds from images.
 """
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Dict, List
+
+import onnxruntime as ort
 from PIL import Image
 from rembg import remove, new_session
 
@@ -11,6 +18,66 @@ class BackgroundRemovalError(Exception):
     pass
 
 
+def _default_worker_count() -> int:
+    configured = int(os.environ.get("REMBG_WORKERS", "0") or "0")
+    if configured > 0:
+        return configured
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+# Dedicated pool for rembg inference so CPU-bound U2Net runs never block the event loop.
+_EXECUTOR = ThreadPoolExecutor(max_workers=_default_worker_count(), thread_name_prefix="rembg")
+
+_SESSIONS: Dict[str, Any] = {}
+_SESSIONS_LOCK = Lock()
+
+
+def _quantized_model_path() -> str:
+    return os.environ.get(
+        "REMBG_MODEL_PATH",
+        os.path.join("weights", "u2net_int8.onnx"),
+    )
+
+
+def _session_providers() -> List[str]:
+    if "CUDAExecutionProvider" in ort.get_available_providers():
+        return ["CUDAExecutionProvider", "CPUExecutionProvider"]
+    return ["CPUExecutionProvider"]
+
+
+def _build_session(model_name: str):
+    providers = _session_providers()
+    # Prefer the INT8-quantized U2Net export for the default model on CPU only;
+    # dynamically quantized ops fall back to the CPU under CUDA.
+    if model_name == "u2net" and "CUDAExecutionProvider" not in providers:
+        model_path = _quantized_model_path()
+        if os.path.exists(model_path):
+            return new_session("u2net_custom", model_path=model_path, providers=providers)
+    return new_session(model_name, providers=providers)
+
+
+def _get_session(model_name: str):
+    """Return the rembg session for model_name, loading the ONNX model only once per process."""
+    session = _SESSIONS.get(model_name)
+    if session is not None:
+        return session
+
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(model_name)
+        if session is None:
+            session = _build_session(model_name)
+            _SESSIONS[model_name] = session
+
+    return session
+
+
+def _run(input_data: Any, model: str) -> Any:
+    try:
+        return remove(input_data, session=_get_session(model))
+    except Exception as e:
+        raise BackgroundRemovalError(f"Failed to remove background: {str(e)}")
+
+
 def remove_background(input_image: bytes, model: str = "u2net") -> bytes:
     """
     Remove background from an image.
@@ -25,11 +92,29 @@ def remove_background(input_image: bytes, model: str = "u2net") -> bytes:
     Raises:
         BackgroundRemovalError: If background removal fails
     """
-    try:
-        output_image = remove(input_image)
-        return output_image
-    except Exception as e:
-        raise BackgroundRemovalError(f"Failed to remove background: {str(e)}")
+    return _run(input_image, model)
+
+
+async def remove_background_async(input_image: bytes, model: str = "u2net") -> bytes:
+    """
+    Remove background from an image on the dedicated rembg worker pool.
+    Runs remove_background in a worker thread to avoid blocking the FastAPI event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_EXECUTOR, remove_background, input_image, model)
+
+
+def _warm_up_session(model: str) -> None:
+    _run(Image.new("RGB", (32, 32)), model)
+
+
+async def warm_up(model: str = "u2net") -> None:
+    """
+    Load the rembg session and run one tiny inference on the worker pool,
+    so the first real request does not pay the model load cost.
+    """
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_EXECUTOR, _warm_up_session, model)
 
 
 def remove_background_with_model(input_image: bytes, model_name: str = "u2net") -> bytes:
@@ -46,12 +131,7 @@ def remove_background_with_model(input_image: bytes, model_name: str = "u2net")
     Raises:
         BackgroundRemovalError: If background removal fails
     """
-    try:
-        session = new_session(model_name)
-        output_image = remove(input_image, session=session)
-        return output_image
-    except Exception as e:
-        raise BackgroundRemovalError(f"Failed to remove background: {str(e)}")
+    return _run(input_image, model_name)
 
 
 def remove_background_pil(image: Image.Image) -> Image.Image:
@@ -67,9 +147,5 @@ def remove_background_pil(image: Image.Image) -> Image.Image:
     Raises:
         BackgroundRemovalError: If background removal fails
     """
-    try:
-        output_image = remove(image)
-        return output_image
-    except Exception as e:
-        raise BackgroundRemovalError(f"Failed to remove background: {str(e)}")
+    return _run(image, "u2net")
 
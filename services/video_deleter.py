@@ -1,10 +1,16 @@
-import asyncio
 import os
 import uuid
 from pathlib import Path
 from typing import List
 
-from .video_processor import VideoProcessingError, cleanup_file, get_video_info
+from .video_processor import (
+    FFMPEG_BIN,
+    FFMPEG_THREADS,
+    VideoProcessingError,
+    _run_ffmpeg_command,
+    cleanup_file,
+    get_video_info,
+)
 
 async def delete_frame_from_video(
     input_path: str,
@@ -83,7 +89,7 @@ async def delete_frame_from_video(
     filter_complex = ';'.join(filter_parts)
 
     ffmpeg_cmd = [
-        'ffmpeg',
+        FFMPEG_BIN,
         '-i', input_path,
         '-filter_complex', filter_complex,
         *map_args,
@@ -93,22 +99,17 @@ async def delete_frame_from_video(
         '-pix_fmt', 'yuv420p',
         '-movflags', '+faststart',
         *audio_codec_args,
+        '-threads', str(FFMPEG_THREADS),
         '-y', output_path
     ]
     
     try:
         print(f"Executing FFmpeg command: {' '.join(ffmpeg_cmd)}")
-        process = await asyncio.create_subprocess_exec(
-            *ffmpeg_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await process.communicate()
+        returncode, _, stderr = await _run_ffmpeg_command(ffmpeg_cmd)
         
-        if process.returncode != 0:
-            print(f"FFmpeg stdout: {stdout.decode()}")
-            print(f"FFmpeg stderr: {stderr.decode()}")
-            raise VideoProcessingError(f"FFmpeg failed to delete frame: {stderr.decode()}")
+        if returncode != 0:
+            print(f"FFmpeg stderr: {stderr}")
+            raise VideoProcessingError(f"FFmpeg failed to delete frame: {stderr}")
         
         if not os.path.exists(output_path):
             raise VideoProcessingError("Output file not created")
@@ -150,27 +151,23 @@ async def delete_multiple_frames(
     video_filter = ",".join(filters)
     
     ffmpeg_cmd = [
-        'ffmpeg',
+        FFMPEG_BIN,
         '-i', input_path,
         '-vf', video_filter,
         '-c:v', 'libx264',
         '-preset', 'fast',
         '-crf', '23',
         '-c:a', 'copy',
+        '-threads', str(FFMPEG_THREADS),
         '-y', output_path
     ]
     
     try:
         print(f"Executing multiple frames FFmpeg: {' '.join(ffmpeg_cmd)}")
-        process = await asyncio.create_subprocess_exec(
-            *ffmpeg_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await process.communicate()
+        returncode, _, stderr = await _run_ffmpeg_command(ffmpeg_cmd)
         
-        if process.returncode != 0:
-            raise VideoProcessingError(f"FFmpeg failed: {stderr.decode()}")
+        if returncode != 0:
+            raise VideoProcessingError(f"FFmpeg failed: {stderr}")
         
         return output_path
         
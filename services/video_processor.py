@@ -4,12 +4,21 @@ Provides functions for video metadata extraction, trimming, adjusting, and overl
 """
 import subprocess
 import json
+import logging
 import os
 import asyncio
+import contextlib
+import copy
+import functools
+import hashlib
+import math
 import shutil
+import tempfile
 import re
 import uuid
-from typing import Optional, List, Tuple, Dict, Any
+from collections import OrderedDict, deque
+from fractions import Fraction
+from typing import Optional, List, Tuple, Dict, Any, Deque
 from models.video_process import TextOverlay, LogoOverlay
 
 
@@ -18,19 +27,73 @@ class VideoProcessingError(Exception):
     pass
 
 
+# Child of the "video" logger configured in main; its level follows DEBUG_KEEP_UPLOADS / DEBUG_VERBOSE.
+logger = logging.getLogger("video.processor")
+
+
+# Each encode is capped at FFMPEG_THREADS threads and only enough encodes run at once to
+# fill the machine, instead of N concurrent requests each spawning threads for every core.
+FFMPEG_THREADS = max(1, int(os.environ.get('FFMPEG_THREADS', '4')))
+FFMPEG_MAX_CONCURRENT = max(1, int(
+    os.environ.get('FFMPEG_MAX_CONCURRENT') or (os.cpu_count() or FFMPEG_THREADS) // FFMPEG_THREADS
+))
+_FFMPEG_SEMAPHORE = asyncio.Semaphore(FFMPEG_MAX_CONCURRENT)
+
+
+# Binaries are resolved once at import; PATH does not change during the process lifetime.
+_FFMPEG_PATH = shutil.which('ffmpeg')
+_FFPROBE_PATH = shutil.which('ffprobe')
+# argv[0] for every subprocess: the absolute path skips the PATH search on each exec.
+FFMPEG_BIN = _FFMPEG_PATH or 'ffmpeg'
+FFPROBE_BIN = _FFPROBE_PATH or 'ffprobe'
+
+
+def get_ffmpeg_path() -> Optional[str]:
+    """Resolved path of the ffmpeg binary, or None if it is not installed"""
+    return _FFMPEG_PATH
+
+
+def get_ffprobe_path() -> Optional[str]:
+    """Resolved path of the ffprobe binary, or None if it is not installed"""
+    return _FFPROBE_PATH
+
+
 def is_ffmpeg_installed() -> bool:
     """Check if FFmpeg is installed on the system"""
-    return shutil.which('ffmpeg') is not None
+    return _FFMPEG_PATH is not None
 
 
 def is_ffprobe_installed() -> bool:
     """Check if FFprobe is installed on the system"""
-    return shutil.which('ffprobe') is not None
+    return _FFPROBE_PATH is not None
+
+
+# ffprobe results keyed on (file size, digest of the first and last 64 KB). Uploads get a
+# fresh path and mtime on every request, so the key is derived from content instead.
+_VIDEO_INFO_CACHE: "OrderedDict[Tuple[int, bytes], Dict[str, Any]]" = OrderedDict()
+_VIDEO_INFO_CACHE_SIZE = int(os.environ.get("VIDEO_INFO_CACHE_SIZE", "256") or "256")
+_FINGERPRINT_BYTES = 64 * 1024
+
+# Only stream headers are needed, so stop libavformat's stream analysis early.
+FFPROBE_PROBESIZE = os.environ.get("FFPROBE_PROBESIZE", "500000")
+
+
+def _file_fingerprint(input_path: str) -> Tuple[int, bytes]:
+    """Cheap content key: container headers live at the start or the end of the file."""
+    size = os.path.getsize(input_path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(input_path, 'rb') as f:
+        digest.update(f.read(_FINGERPRINT_BYTES))
+        if size > _FINGERPRINT_BYTES:
+            f.seek(max(_FINGERPRINT_BYTES, size - _FINGERPRINT_BYTES))
+            digest.update(f.read(_FINGERPRINT_BYTES))
+    return size, digest.digest()
 
 
 async def get_video_info(input_path: str) -> Dict[str, Any]:
     """
     Extract video metadata using ffprobe.
+    Results are cached by file content, so re-probing the same upload skips ffprobe.
     
     Args:
         input_path: Path to the video file
@@ -41,15 +104,30 @@ async def get_video_info(input_path: str) -> Dict[str, Any]:
     Raises:
         VideoProcessingError: If ffprobe fails or video info cannot be extracted
     """
-    if not os.path.exists(input_path):
+    try:
+        cache_key = await asyncio.to_thread(_file_fingerprint, input_path)
+    except FileNotFoundError:
         raise VideoProcessingError(f"Input file not found: {input_path}")
-    
+    cached = _VIDEO_INFO_CACHE.get(cache_key)
+    if cached is not None:
+        _VIDEO_INFO_CACHE.move_to_end(cache_key)
+        return copy.deepcopy(cached)
+
+    info = await _probe_video_info(input_path)
+    _VIDEO_INFO_CACHE[cache_key] = copy.deepcopy(info)
+    while len(_VIDEO_INFO_CACHE) > _VIDEO_INFO_CACHE_SIZE:
+        _VIDEO_INFO_CACHE.popitem(last=False)
+    return info
+
+
+async def _probe_video_info(input_path: str) -> Dict[str, Any]:
     ffprobe_cmd = [
-        'ffprobe',
+        FFPROBE_BIN,
         '-v', 'error',
+        '-probesize', FFPROBE_PROBESIZE,
         '-show_entries',
-        'stream=index,codec_type,codec_name,width,height,r_frame_rate,display_aspect_ratio,channels,sample_rate',
-        '-show_entries', 'format=duration,size,bit_rate,format_name',
+        'stream=index,codec_type,codec_name,pix_fmt,width,height,r_frame_rate,display_aspect_ratio,channels,sample_rate',
+        '-show_entries', 'format=duration,start_time,size,bit_rate,format_name',
         '-of', 'json',
         input_path
     ]
@@ -78,18 +156,22 @@ async def get_video_info(input_path: str) -> Dict[str, Any]:
         audio_stream = next((s for s in streams if s.get('codec_type') == 'audio'), None)
         format_info = probe_data.get('format', {})
         
-        # Calculate FPS from r_frame_rate (e.g., "30/1" -> 30.0)
-        fps_parts = video_stream.get('r_frame_rate', '30/1').split('/')
-        fps = float(fps_parts[0]) / float(fps_parts[1]) if len(fps_parts) == 2 else 30.0
+        # Calculate FPS from r_frame_rate (e.g., "30/1" -> 30.0); broken files report "0/0"
+        try:
+            fps = float(Fraction(video_stream.get('r_frame_rate') or '30/1'))
+        except (ValueError, ZeroDivisionError):
+            fps = 30.0
         
         info = {
             'duration': float(format_info.get('duration', 0)),
+            'start_time': float(format_info.get('start_time', 0) or 0),
             'size': int(format_info.get('size', 0)),
             'bitrate': int(format_info.get('bit_rate', 0)),
             'format': format_info.get('format_name', 'unknown'),
             'has_audio': bool(audio_stream),
             'video': {
                 'codec': video_stream.get('codec_name', 'unknown'),
+                'pix_fmt': video_stream.get('pix_fmt'),
                 'width': int(video_stream.get('width', 0)),
                 'height': int(video_stream.get('height', 0)),
                 'fps': fps,
@@ -112,14 +194,44 @@ async def get_video_info(input_path: str) -> Dict[str, Any]:
         raise VideoProcessingError(f"Failed to parse ffprobe output: {str(e)}")
 
 
-async def _run_ffmpeg_command(command: List[str]) -> Tuple[int, str, str]:
-    process = await asyncio.create_subprocess_exec(
-        *command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
-    )
-    stdout, stderr = await process.communicate()
-    return process.returncode, stdout.decode(errors='ignore'), stderr.decode(errors='ignore')
+# ffmpeg writes progress to stderr for the whole encode; only the tail is kept for errors.
+_STREAM_READ_SIZE = 64 * 1024
+_STDERR_TAIL_CHUNKS = 64
+
+
+async def _drain_stream(stream: asyncio.StreamReader, chunks: Any) -> None:
+    while True:
+        chunk = await stream.read(_STREAM_READ_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+
+
+async def _run_ffmpeg_command(
+    command: List[str],
+    capture_stdout: bool = False,
+    limit: bool = True
+) -> Tuple[int, str, str]:
+    """
+    Run ffmpeg; stdout is discarded unless capture_stdout is set.
+
+    Encodes wait for a slot under FFMPEG_MAX_CONCURRENT. Stream copies, probes and test
+    encodes pass limit=False: they are short and must not queue behind a long encode.
+    """
+    async with _FFMPEG_SEMAPHORE if limit else contextlib.nullcontext():
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE if capture_stdout else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout_chunks: List[bytes] = []
+        stderr_tail: Deque[bytes] = deque(maxlen=_STDERR_TAIL_CHUNKS)
+        drains = [_drain_stream(process.stderr, stderr_tail)]
+        if capture_stdout:
+            drains.append(_drain_stream(process.stdout, stdout_chunks))
+        await asyncio.gather(*drains)
+        returncode = await process.wait()
+    return returncode, b''.join(stdout_chunks).decode(errors='ignore'), b''.join(stderr_tail).decode(errors='replace')
 
 
 async def _create_ts_segment(
@@ -131,7 +243,7 @@ async def _create_ts_segment(
     if not os.path.exists(input_path):
         raise VideoProcessingError(f"Input file not found: {input_path}")
 
-    ffmpeg_cmd = ['ffmpeg']
+    ffmpeg_cmd = [FFMPEG_BIN]
     if start is not None:
         ffmpeg_cmd.extend(['-ss', str(start)])
     ffmpeg_cmd.extend(['-i', input_path])
@@ -146,7 +258,7 @@ async def _create_ts_segment(
         output_path
     ])
 
-    returncode, _, stderr = await _run_ffmpeg_command(ffmpeg_cmd)
+    returncode, _, stderr = await _run_ffmpeg_command(ffmpeg_cmd, limit=False)
     if returncode != 0:
         raise VideoProcessingError(f"Failed to create TS segment: {stderr}")
 
@@ -241,7 +353,7 @@ async def merge_videos(
             concat_file.write(f"file '{os.path.abspath(ts_file)}'\n")
 
     ffmpeg_cmd = [
-        'ffmpeg',
+        FFMPEG_BIN,
         '-f', 'concat',
         '-safe', '0',
         '-i', concat_list_path,
@@ -251,7 +363,7 @@ async def merge_videos(
         output_path
     ]
 
-    returncode, _, stderr = await _run_ffmpeg_command(ffmpeg_cmd)
+    returncode, _, stderr = await _run_ffmpeg_command(ffmpeg_cmd, limit=False)
     if returncode != 0:
         raise VideoProcessingError(f"Failed to merge videos: {stderr}")
 
@@ -278,16 +390,47 @@ def _resolve_overlay_time(primary: Optional[float], secondary: Optional[float],
     return default
 
 
+def _escape_filter_value(value: str) -> str:
+    """
+    Escape a string for use as an unquoted filter option value inside a filtergraph.
+
+    FFmpeg unescapes twice: first the filtergraph parser (\\ ' [ ] , ;), then the filter's
+    option parser (\\ ' :). Whitespace is escaped at both levels so neither parser trims
+    leading/trailing spaces.
+    """
+    option_escaped = re.sub(r"([\\':\s])", r"\\\1", value)
+    return re.sub(r"([\\'\[\],;\s])", r"\\\1", option_escaped)
+
+
 def _escape_drawtext_text(text: str) -> str:
-    """Escape text for FFmpeg drawtext filter."""
-    return (
-        text
-        .replace("\\", "\\\\")
-        .replace(":", "\\:")
-        .replace("'", "\\'")
-        .replace("%", "\\%")
-        .replace("\n", "\\n")
-    )
+    """Escape text for an unquoted drawtext text= option used with expansion=none."""
+    return _escape_filter_value(text)
+
+
+# Texts longer than this are handed to drawtext through a file in UPLOAD_DIR (the same
+# directory main.py stores uploads in) instead of inline.
+DRAWTEXT_TEXTFILE_MIN_LENGTH = 64
+DRAWTEXT_FILE_DIR = os.environ.get("UPLOAD_DIR", "uploads")
+
+
+def _drawtext_source(text: str, drawtext_files: Optional[List[str]]) -> str:
+    """
+    drawtext options naming the text: escaped inline text=, or textfile= for long texts when
+    drawtext_files is given. Both draw the text verbatim (expansion=none).
+    """
+    if drawtext_files is None or len(text) <= DRAWTEXT_TEXTFILE_MIN_LENGTH:
+        return f"text={_escape_drawtext_text(text)}:expansion=none"
+
+    os.makedirs(DRAWTEXT_FILE_DIR, exist_ok=True)
+    fd, text_path = tempfile.mkstemp(prefix='drawtext_', suffix='.txt', dir=DRAWTEXT_FILE_DIR)
+    drawtext_files.append(text_path)
+    with os.fdopen(fd, 'w', encoding='utf-8') as text_file:
+        text_file.write(text)
+    return f"textfile={_escape_filter_value(text_path)}:expansion=none"
+
+
+_HEX_COLOR_SHORT_RE = re.compile(r'[0-9a-fA-F]{3}')
+_HEX_COLOR_RE = re.compile(r'[0-9a-fA-F]{6}([0-9a-fA-F]{2})?')
 
 
 def _normalize_ffmpeg_color(color: Optional[str]) -> str:
@@ -301,13 +444,25 @@ def _normalize_ffmpeg_color(color: Optional[str]) -> str:
     if not value.startswith('#'):
         return value
     hex_value = value[1:]
-    if len(hex_value) == 3 and re.fullmatch(r'[0-9a-fA-F]{3}', hex_value):
+    if len(hex_value) == 3 and _HEX_COLOR_SHORT_RE.fullmatch(hex_value):
         hex_value = ''.join(ch * 2 for ch in hex_value)
-    if re.fullmatch(r'[0-9a-fA-F]{6}([0-9a-fA-F]{2})?', hex_value):
+    if _HEX_COLOR_RE.fullmatch(hex_value):
         return f"0x{hex_value}"
     return 'white'
 
 
+_EQ_IDENTITY_TOLERANCE = 1e-4
+
+
+def _is_identity_adjustment(brightness: float, contrast: float, saturation: float) -> bool:
+    """True when the eq filter would leave every pixel unchanged (within slider rounding)."""
+    return (
+        math.isclose(brightness, 0.0, abs_tol=_EQ_IDENTITY_TOLERANCE)
+        and math.isclose(contrast, 1.0, abs_tol=_EQ_IDENTITY_TOLERANCE)
+        and math.isclose(saturation, 1.0, abs_tol=_EQ_IDENTITY_TOLERANCE)
+    )
+
+
 def build_overlay_filter(
     trim_start: float,
     text_overlays: List[TextOverlay],
@@ -318,7 +473,14 @@ def build_overlay_filter(
     logo_file_sequence: Optional[List[Optional[str]]] = None,
     brightness: float = 0.0,
     contrast: float = 1.0,
-    saturation: float = 1.0
+    saturation: float = 1.0,
+    hw_upload: bool = False,
+    source_label: str = '0:v',
+    label_prefix: str = '',
+    logo_input_offset: int = 1,
+    output_label: str = 'outv',
+    input_pix_fmt: Optional[str] = None,
+    drawtext_files: Optional[List[str]] = None
 ) -> Tuple[str, List[str]]:
     """
     Build FFmpeg filter_complex string for video processing.
@@ -334,12 +496,22 @@ def build_overlay_filter(
         brightness: Brightness adjustment (-1 to 1)
         contrast: Contrast adjustment (0 to 4)
         saturation: Saturation adjustment (0 to 4)
+        hw_upload: Upload the final frames to a VAAPI surface for hardware encoding
+        source_label: Filter graph label of the video to draw on
+        label_prefix: Prefix for intermediate labels, so several graphs can share one filter_complex
+        logo_input_offset: FFmpeg input index of the first logo file
+        output_label: Label of the final video stream
+        input_pix_fmt: Pixel format of the source; yuv420p skips the final format conversion
+        drawtext_files: If given, texts longer than DRAWTEXT_TEXTFILE_MIN_LENGTH are written to
+            files in UPLOAD_DIR read via textfile=; their paths are appended here for the caller to delete
         
     Returns:
         Tuple of (filter_complex string, list of additional input files)
     """
     inputs: List[str] = []
     resolved_logo_paths: List[Optional[str]] = []
+    # One stat() per distinct file, however many overlays reuse it.
+    logo_path_exists: Dict[str, bool] = {}
 
     for idx, logo in enumerate(logo_overlays):
         logo_file_path: Optional[str] = None
@@ -347,27 +519,31 @@ def build_overlay_filter(
             logo_file_path = logo_file_sequence[idx]
         if not logo_file_path:
             logo_file_path = logo_files.get(logo.filename)
-        if logo_file_path and os.path.exists(logo_file_path):
+        if logo_file_path and logo_file_path not in logo_path_exists:
+            logo_path_exists[logo_file_path] = os.path.exists(logo_file_path)
+        if logo_file_path and logo_path_exists[logo_file_path]:
             resolved_logo_paths.append(logo_file_path)
             inputs.extend(['-i', logo_file_path])
         else:
             resolved_logo_paths.append(None)
 
-    # Add logo inputs first
-    # Build filter complex
-    # Start with brightness/contrast/saturation adjustment
-    # eq=brightness=X:contrast=Y:saturation=Z
-    filter_complex = f"[0:v]eq=brightness={brightness}:contrast={contrast}:saturation={saturation}[base]"
-    
-    current_label = 'base'
-    logo_index = 1
-    
-    # Add logo overlays
+    # The graph's shape is compiled once per layout and cached; only the values change per call.
+    apply_eq = not _is_identity_adjustment(brightness, contrast, saturation)
+    values: Dict[str, Any] = {}
+    if apply_eq:
+        values.update(brightness=brightness, contrast=contrast, saturation=saturation)
+
+    # Logo and font sizes are authored against a 640px-wide frontend preview.
+    preview_width = 640
+    scale_factor = video_width / preview_width
+
+    logo_indexes: List[int] = []
     for idx, logo in enumerate(logo_overlays):
         logo_file_path = resolved_logo_paths[idx] if idx < len(resolved_logo_paths) else None
         if not logo_file_path:
             continue
-        
+        logo_indexes.append(idx)
+
         # Calculate start and end times relative to trim
         start_value = _resolve_overlay_time(logo.start, logo.startTime, 0.0) or 0.0
         end_value = _resolve_overlay_time(logo.end, logo.endTime, None)
@@ -376,56 +552,286 @@ def build_overlay_filter(
         if end_time is not None:
             end_time = max(0.0, end_time - trim_start)
 
-        enable_clause = f"enable='between(t,{start_time},{end_time if end_time is not None else 1e9})'"
-        
-        # Scale logo based on video resolution
-        # Assuming frontend preview is 640px wide
-        preview_width = 640
-        scale_factor = video_width / preview_width
-        scaled_width = round((logo.width or 100) * scale_factor)
-        scaled_height = round((logo.height or 100) * scale_factor)
-        
-        scaled_label = f"logo{idx}"
-        
-        # Add scale filter for logo
-        filter_complex += f";[{logo_index}:v]scale={scaled_width}:{scaled_height}[{scaled_label}]"
-        
-        # Add overlay filter
-        filter_complex += f";[{current_label}][{scaled_label}]overlay=(main_w*{logo.x}/100):(main_h*{logo.y}/100):{enable_clause}[out{idx}]"
-        current_label = f"out{idx}"
-        logo_index += 1
-    
-    # Add text overlays
-    for idx, text in enumerate(text_overlays):
-        # Calculate start and end times relative to trim
-        start_value = _resolve_overlay_time(text.start, text.startTime, 0.0) or 0.0
-        end_value = _resolve_overlay_time(text.end, text.endTime, None)
-        start_time = max(0.0, start_value - trim_start)
-        end_time = end_value
-        if end_time is not None:
-            end_time = max(0.0, end_time - trim_start)
+        values[f"logo{idx}_w"] = round((logo.width or 100) * scale_factor)
+        values[f"logo{idx}_h"] = round((logo.height or 100) * scale_factor)
+        values[f"logo{idx}_x"] = logo.x
+        values[f"logo{idx}_y"] = logo.y
+        values[f"logo{idx}_enable"] = _enable_option(start_time, end_time)
 
-        enable_clause = f"enable='between(t,{start_time},{end_time if end_time is not None else 1e9})'"
-        
-        # Scale font size based on video resolution
-        preview_width = 640
-        scale_factor = video_width / preview_width
-        base_fontsize = text.fontSize or text.fontsize or 24
-        scaled_fontsize = round(base_fontsize * scale_factor)
-        
-        # Get font color (handle alternative field names)
-        font_color = _normalize_ffmpeg_color(text.color or text.fontcolor or 'white')
-        escaped_text = _escape_drawtext_text(text.text or '')
+    created_files_start = len(drawtext_files) if drawtext_files is not None else 0
+    try:
+        for idx, text in enumerate(text_overlays):
+            # Calculate start and end times relative to trim
+            start_value = _resolve_overlay_time(text.start, text.startTime, 0.0) or 0.0
+            end_value = _resolve_overlay_time(text.end, text.endTime, None)
+            start_time = max(0.0, start_value - trim_start)
+            end_time = end_value
+            if end_time is not None:
+                end_time = max(0.0, end_time - trim_start)
+
+            base_fontsize = text.fontSize or text.fontsize or 24
+            values[f"text{idx}_source"] = _drawtext_source(text.text or '', drawtext_files)
+            values[f"text{idx}_x"] = text.x
+            values[f"text{idx}_y"] = text.y
+            values[f"text{idx}_fontsize"] = round(base_fontsize * scale_factor)
+            values[f"text{idx}_color"] = _normalize_ffmpeg_color(text.color or text.fontcolor or 'white')
+            values[f"text{idx}_enable"] = _enable_option(start_time, end_time)
+    except Exception:
+        if drawtext_files is not None:
+            cleanup_files(drawtext_files[created_files_start:])
+            del drawtext_files[created_files_start:]
+        raise
+
+    if hw_upload:
+        final_stage = 'hwupload'
+    elif input_pix_fmt == 'yuv420p':
+        final_stage = 'passthrough'
+    else:
+        final_stage = 'yuv420p'
+
+    layout = (
+        source_label,
+        label_prefix,
+        logo_input_offset,
+        output_label,
+        apply_eq,
+        tuple(logo_indexes),
+        len(text_overlays),
+        final_stage,
+    )
+    return _compile_filter_template(layout).format(**values), inputs
+
+
+def _enable_option(start_time: float, end_time: Optional[float]) -> str:
+    """Timeline option appended to an overlay/drawtext filter; empty when always on."""
+    if end_time is None:
+        if start_time <= 0:
+            return ''
+        return f":enable='gte(t,{start_time})'"
+    return f":enable='between(t,{start_time},{end_time})'"
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_filter_template(layout: Tuple[Any, ...]) -> str:
+    """
+    Build the filter_complex skeleton for a graph layout as a str.format template.
+
+    Labels and input indexes are fixed by the layout; per-call values (eq levels, logo
+    sizes and positions, text content, timing) are left as {placeholders}.
+    """
+    (
+        source_label,
+        label_prefix,
+        logo_input_offset,
+        output_label,
+        apply_eq,
+        logo_indexes,
+        text_count,
+        final_stage,
+    ) = layout
+
+    # Start with brightness/contrast/saturation adjustment
+    # eq=brightness=X:contrast=Y:saturation=Z (skipped entirely when it would be a no-op)
+    filter_parts: List[str] = []
+    current_label = source_label
+    if apply_eq:
+        base_label = f"{label_prefix}base"
+        filter_parts.append(
+            f"[{current_label}]eq=brightness={{brightness}}:contrast={{contrast}}:saturation={{saturation}}[{base_label}]"
+        )
+        current_label = base_label
+
+    # Add logo overlays; logo inputs follow the main input in resolved order
+    for logo_index, idx in enumerate(logo_indexes, start=logo_input_offset):
+        scaled_label = f"{label_prefix}logo{idx}"
+        overlay_label = f"{label_prefix}out{idx}"
+        filter_parts.append(f"[{logo_index}:v]scale={{logo{idx}_w}}:{{logo{idx}_h}}[{scaled_label}]")
+        filter_parts.append(
+            f"[{current_label}][{scaled_label}]overlay=(main_w*{{logo{idx}_x}}/100):(main_h*{{logo{idx}_y}}/100)"
+            f"{{logo{idx}_enable}}[{overlay_label}]"
+        )
+        current_label = overlay_label
+
+    # Add text overlays
+    for idx in range(text_count):
+        text_label = f"{label_prefix}outtext{idx}"
+        filter_parts.append(
+            f"[{current_label}]drawtext={{text{idx}_source}}:x=(w*{{text{idx}_x}}/100):y=(h*{{text{idx}_y}}/100)"
+            f":fontsize={{text{idx}_fontsize}}:fontcolor={{text{idx}_color}}{{text{idx}_enable}}[{text_label}]"
+        )
+        current_label = text_label
 
-        drawtext_filter = f"drawtext=text='{escaped_text}':x=(w*{text.x}/100):y=(h*{text.y}/100):fontsize={scaled_fontsize}:fontcolor={font_color}:{enable_clause}"
-        
-        filter_complex += f";[{current_label}]{drawtext_filter}[outtext{idx}]"
-        current_label = f"outtext{idx}"
-    
     # Final format conversion
-    filter_complex += f";[{current_label}]format=yuv420p[outv]"
-    
-    return filter_complex, inputs
+    if final_stage == 'hwupload':
+        filter_parts.append(f"[{current_label}]format=nv12,hwupload[{output_label}]")
+    elif final_stage == 'passthrough':
+        # eq, overlay and drawtext all keep yuv420p, so the frames are already in output format.
+        filter_parts.append(f"[{current_label}]null[{output_label}]")
+    else:
+        filter_parts.append(f"[{current_label}]format=yuv420p[{output_label}]")
+
+    return ';'.join(filter_parts)
+
+
+# H.264 encoder for process_video: "auto" picks the first hardware encoder that passes a
+# test encode, falling back to libx264. libx264 or one of _HW_ENCODERS can be forced explicitly.
+VIDEO_ENCODER = os.environ.get("VIDEO_ENCODER", "auto")
+VAAPI_DEVICE = os.environ.get("VAAPI_DEVICE", "/dev/dri/renderD128")
+_HW_ENCODERS = ('h264_nvenc', 'h264_qsv', 'h264_vaapi')
+_VALID_VIDEO_ENCODERS = ('auto', 'libx264', *_HW_ENCODERS)
+_selected_encoder: Optional[str] = None
+_encoder_lock = asyncio.Lock()
+
+
+def _hw_device_args(encoder: str) -> List[str]:
+    if encoder == 'h264_vaapi':
+        return ['-vaapi_device', VAAPI_DEVICE]
+    return []
+
+
+# libx264 tuning: frame threads (not sliced) with a shorter lookahead; X264_TUNE="" disables -tune.
+X264_TUNE = os.environ.get("X264_TUNE", "film")
+_X264_PARAMS = 'sliced-threads=0:lookahead_threads=2:rc-lookahead=20'
+
+
+def _video_encoder_args(encoder: str, x264_tune: Optional[str] = None) -> List[str]:
+    if encoder == 'h264_nvenc':
+        return ['-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-bf', '2',
+                '-pix_fmt', 'yuv420p']
+    if encoder == 'h264_qsv':
+        return ['-c:v', 'h264_qsv', '-preset', 'fast', '-global_quality', '23', '-pix_fmt', 'nv12']
+    if encoder == 'h264_vaapi':
+        # Frames are already VAAPI surfaces (format=nv12,hwupload in the filter graph).
+        return ['-c:v', 'h264_vaapi']
+    tune = X264_TUNE if x264_tune is None else x264_tune
+    tune_args = ['-tune', tune] if tune else []
+    return ['-c:v', 'libx264', '-preset', 'fast', *tune_args, '-x264-params', _X264_PARAMS, '-pix_fmt', 'yuv420p']
+
+
+async def _encoder_works(encoder: str) -> bool:
+    """Run a tiny test encode; listing an encoder does not mean the device is usable."""
+    video_filter = 'format=nv12,hwupload' if encoder == 'h264_vaapi' else 'format=yuv420p'
+    test_cmd = [
+        FFMPEG_BIN, '-hide_banner', '-v', 'error',
+        *_hw_device_args(encoder),
+        '-f', 'lavfi', '-i', 'color=black:s=256x256:d=0.1',
+        '-vf', video_filter,
+        *_video_encoder_args(encoder),
+        '-f', 'null', '-'
+    ]
+    returncode, _, _ = await _run_ffmpeg_command(test_cmd, limit=False)
+    return returncode == 0
+
+
+async def _select_video_encoder() -> str:
+    global _selected_encoder
+    if _selected_encoder is not None:
+        return _selected_encoder
+
+    async with _encoder_lock:
+        if _selected_encoder is None:
+            encoder = VIDEO_ENCODER
+            if encoder not in _VALID_VIDEO_ENCODERS:
+                logger.warning(
+                    "Unsupported VIDEO_ENCODER %r (expected one of %s); using auto",
+                    encoder, ', '.join(_VALID_VIDEO_ENCODERS)
+                )
+                encoder = 'auto'
+            if encoder == 'auto':
+                encoder = 'libx264'
+                returncode, stdout, _ = await _run_ffmpeg_command(
+                    [FFMPEG_BIN, '-hide_banner', '-encoders'], capture_stdout=True, limit=False
+                )
+                available = set(stdout.split()) if returncode == 0 else set()
+                for candidate in _HW_ENCODERS:
+                    if candidate in available and await _encoder_works(candidate):
+                        encoder = candidate
+                        break
+            logger.info("Using video encoder: %s", encoder)
+            _selected_encoder = encoder
+
+    return _selected_encoder
+
+
+# Audio codecs that can be stream-copied into an MP4 container as-is.
+_STREAM_COPY_AUDIO_CODECS = {'aac', 'mp3'}
+
+
+# Trimmed requests are remuxed when the start is at most this many seconds past a keyframe.
+REMUX_KEYFRAME_TOLERANCE = float(os.environ.get("REMUX_KEYFRAME_TOLERANCE", "0.1"))
+_KEYFRAME_SEARCH_WINDOW = 10.0
+
+
+async def _find_keyframe_before(input_path: str, time_point: float, start_time: float = 0.0) -> Optional[float]:
+    """
+    Time of the last video keyframe at or before time_point, if one is found nearby.
+
+    time_point and the result are relative to the container start (like -ss); ffprobe's
+    -read_intervals and pts_time are absolute stream timestamps, offset by start_time.
+    """
+    absolute_time = time_point + start_time
+    ffprobe_cmd = [
+        FFPROBE_BIN,
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-skip_frame', 'nokey',
+        '-read_intervals', f"{max(0.0, absolute_time - _KEYFRAME_SEARCH_WINDOW):.6f}%{absolute_time + 0.001:.6f}",
+        '-show_entries', 'frame=pts_time',
+        '-of', 'csv=p=0',
+        input_path
+    ]
+    process = await asyncio.create_subprocess_exec(
+        *ffprobe_cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    stdout, _ = await process.communicate()
+    if process.returncode != 0:
+        return None
+
+    keyframe_time: Optional[float] = None
+    for line in stdout.decode(errors='ignore').splitlines():
+        try:
+            # ffprobe prints times with microsecond precision; rounding back to that grid
+            # drops float noise from the subtraction (3.402 - 1.4 -> 2.0020000000000002),
+            # so -ss lands exactly on the keyframe.
+            pts_time = round(float(line.strip().strip(',')) - start_time, 6)
+        except ValueError:
+            continue
+        if pts_time <= time_point + 1e-6 and (keyframe_time is None or pts_time > keyframe_time):
+            keyframe_time = pts_time
+    return max(0.0, keyframe_time) if keyframe_time is not None else None
+
+
+async def _remux_video(
+    input_path: str,
+    output_path: str,
+    trim_start: float,
+    duration: Optional[float]
+) -> bool:
+    """Copy the first video and audio stream into a new MP4 without re-encoding."""
+    ffmpeg_cmd = [FFMPEG_BIN, '-ss', str(trim_start)]
+    if duration is not None:
+        ffmpeg_cmd.extend(['-t', str(duration)])
+    ffmpeg_cmd.extend([
+        '-i', input_path,
+        '-map', '0:v:0',
+        '-map', '0:a:0?',
+        '-c', 'copy',
+        '-movflags', '+faststart',
+        '-y',
+        output_path
+    ])
+
+    returncode, _, stderr = await _run_ffmpeg_command(ffmpeg_cmd, limit=False)
+    if returncode != 0:
+        raise VideoProcessingError(f"Failed to remux video: {stderr}")
+
+    if not await asyncio.to_thread(os.path.exists, output_path):
+        raise VideoProcessingError("FFmpeg completed but output file was not created")
+
+    print(f"[SUCCESS] Video remuxed without re-encoding: {output_path}")
+    return True
 
 
 async def process_video(
@@ -446,7 +852,8 @@ async def process_video(
     music_end: Optional[float] = None,
     music_volume: float = 1.0,
     source_audio_volume: float = 1.0,
-    debug_mode: bool = False
+    debug_mode: bool = False,
+    x264_tune: Optional[str] = None
 ) -> bool:
     """
     Process video with FFmpeg using the specified parameters.
@@ -463,7 +870,10 @@ async def process_video(
         logo_overlays: List of logo overlay configurations
         logo_files: Dictionary mapping logo filenames to file paths
         logo_file_sequence: Optional list of logo file paths aligned to overlays by index
+        source_audio_volume: Original audio volume multiplier (0-2); at 1.0 with no music
+            tracks, AAC/MP3 source audio is stream-copied instead of re-encoded
         debug_mode: If True, keep intermediate files for debugging
+        x264_tune: libx264 -tune value (defaults to X264_TUNE; "" for none)
         
     Returns:
         True if processing succeeded
@@ -471,11 +881,19 @@ async def process_video(
     Raises:
         VideoProcessingError: If FFmpeg fails
     """
-    if not os.path.exists(input_path):
-        raise VideoProcessingError(f"Input file not found: {input_path}")
-    
-    # Get video dimensions for scaling
-    video_info = await get_video_info(input_path)
+    music_candidates = [
+        track.get("path") for track in (music_tracks or []) if isinstance(track, dict) and track.get("path")
+    ]
+    if music_path:
+        music_candidates.append(music_path)
+
+    # Probe the input (raises if it is missing), pick the encoder and stat the music
+    # files concurrently; none of them depends on another.
+    video_info, video_encoder, existing_paths = await asyncio.gather(
+        get_video_info(input_path),
+        _select_video_encoder(),
+        asyncio.to_thread(_existing_paths, music_candidates),
+    )
     video_width = video_info['video']['width']
     video_height = video_info['video']['height']
     
@@ -484,21 +902,7 @@ async def process_video(
     logo_overlays = logo_overlays or []
     logo_files = logo_files or {}
     logo_file_sequence = logo_file_sequence or []
-    
-    # Build filter complex
-    filter_complex, additional_inputs = build_overlay_filter(
-        trim_start=trim_start,
-        text_overlays=text_overlays,
-        logo_overlays=logo_overlays,
-        logo_files=logo_files,
-        logo_file_sequence=logo_file_sequence,
-        video_width=video_width,
-        video_height=video_height,
-        brightness=brightness,
-        contrast=contrast,
-        saturation=saturation
-    )
-    
+
     source_duration = float(video_info.get('duration', 0) or 0)
     has_source_audio = bool(video_info.get('has_audio'))
     bounded_source_audio_volume = max(0.0, min(float(source_audio_volume), 2.0))
@@ -509,27 +913,12 @@ async def process_video(
     if output_duration is not None and output_duration <= 0:
         raise VideoProcessingError("Trim duration is 0 after applying trim start/time range")
 
-    # Build FFmpeg command
-    ffmpeg_cmd = [
-        'ffmpeg',
-        '-ss', str(trim_start),
-    ]
-
-    if output_duration is not None:
-        ffmpeg_cmd.extend(['-t', str(output_duration)])
-
-    ffmpeg_cmd.extend([
-        '-i', input_path,
-        *additional_inputs,
-    ])
-
-    logo_input_count = len(additional_inputs) // 2
     music_track_defs: List[Dict[str, Any]] = []
     for track in (music_tracks or []):
         if not isinstance(track, dict):
             continue
         track_path = track.get("path")
-        if not track_path or not os.path.exists(track_path):
+        if not track_path or track_path not in existing_paths:
             continue
         music_track_defs.append({
             "path": track_path,
@@ -539,7 +928,7 @@ async def process_video(
         })
 
     # Backward compatibility for single music input.
-    if not music_track_defs and music_path and os.path.exists(music_path):
+    if not music_track_defs and music_path and music_path in existing_paths:
         music_track_defs.append({
             "path": music_path,
             "start": float(music_start or 0.0),
@@ -547,12 +936,81 @@ async def process_video(
             "volume": float(music_volume or 1.0),
         })
 
+    # Nothing to filter, mix or re-time: remux the source streams instead of re-encoding.
+    source_audio_codec = (video_info.get('audio') or {}).get('codec')
+    if (
+        not text_overlays
+        and not logo_overlays
+        and not music_track_defs
+        and _is_identity_adjustment(brightness, contrast, saturation)
+        and video_info['video'].get('codec') == 'h264'
+        and video_info['video'].get('pix_fmt') == 'yuv420p'
+        and (
+            not has_source_audio
+            or (bounded_source_audio_volume == 1.0 and source_audio_codec in _STREAM_COPY_AUDIO_CODECS)
+        )
+    ):
+        if trim_start == 0:
+            return await _remux_video(input_path, output_path, trim_start, output_duration)
+        # A stream copy can only start on a keyframe; snap back to one if it is close enough.
+        keyframe_time = await _find_keyframe_before(
+            input_path, trim_start, float(video_info.get('start_time', 0.0) or 0.0)
+        )
+        if keyframe_time is not None and trim_start - keyframe_time <= REMUX_KEYFRAME_TOLERANCE:
+            remux_duration = output_duration
+            if remux_duration is not None:
+                remux_duration = round(remux_duration + trim_start - keyframe_time, 6)
+            return await _remux_video(input_path, output_path, keyframe_time, remux_duration)
+
+    # Build filter complex (in a worker thread: it stats every logo file)
+    drawtext_files: List[str] = []
+    filter_complex, additional_inputs = await asyncio.to_thread(
+        build_overlay_filter,
+        trim_start=trim_start,
+        text_overlays=text_overlays,
+        logo_overlays=logo_overlays,
+        logo_files=logo_files,
+        logo_file_sequence=logo_file_sequence,
+        video_width=video_width,
+        video_height=video_height,
+        brightness=brightness,
+        contrast=contrast,
+        saturation=saturation,
+        hw_upload=video_encoder == 'h264_vaapi',
+        input_pix_fmt=video_info['video'].get('pix_fmt'),
+        drawtext_files=drawtext_files
+    )
+
+    # Build FFmpeg command
+    ffmpeg_cmd = [
+        FFMPEG_BIN,
+        *_hw_device_args(video_encoder),
+        '-ss', str(trim_start),
+    ]
+
+    if output_duration is not None:
+        ffmpeg_cmd.extend(['-t', str(output_duration)])
+
+    ffmpeg_cmd.extend([
+        '-i', input_path,
+        *additional_inputs,
+    ])
+
+    logo_input_count = len(additional_inputs) // 2
     music_input_indexes: List[int] = []
     for track in music_track_defs:
         music_input_indexes.append(1 + logo_input_count + len(music_input_indexes))
         ffmpeg_cmd.extend(['-i', track["path"]])
 
     filter_complex_audio = filter_complex
+    # The graph only touches video: copy the source audio as-is unless it has to be
+    # mixed, re-leveled, or transcoded to fit the MP4 container.
+    copy_source_audio = (
+        source_audio_enabled
+        and not music_track_defs
+        and bounded_source_audio_volume == 1.0
+        and source_audio_codec in _STREAM_COPY_AUDIO_CODECS
+    )
     map_audio_args: List[str] = []
     audio_codec_args: List[str] = []
 
@@ -640,10 +1098,16 @@ async def process_video(
             )
             map_audio_args = ['-map', '[outa]']
             audio_codec_args = ['-c:a', 'aac', '-b:a', '192k']
+        elif copy_source_audio:
+            map_audio_args = ['-map', '0:a:0']
+            audio_codec_args = ['-c:a', 'copy']
         elif source_audio_enabled:
             filter_complex_audio += f';[0:a]volume={bounded_source_audio_volume},aresample=async=1[outa]'
             map_audio_args = ['-map', '[outa]']
             audio_codec_args = ['-c:a', 'aac', '-b:a', '192k']
+    elif copy_source_audio:
+        map_audio_args = ['-map', '0:a:0']
+        audio_codec_args = ['-c:a', 'copy']
     elif source_audio_enabled:
         filter_complex_audio += f';[0:a]volume={bounded_source_audio_volume},aresample=async=1[outa]'
         map_audio_args = ['-map', '[outa]']
@@ -661,32 +1125,24 @@ async def process_video(
         ffmpeg_cmd.append('-an')
 
     ffmpeg_cmd.extend([
-        '-c:v', 'libx264',
-        '-preset', 'fast',
-        '-pix_fmt', 'yuv420p',
+        *_video_encoder_args(video_encoder, x264_tune),
+        '-threads', str(FFMPEG_THREADS),
         '-movflags', '+faststart',
         '-y',
         output_path
     ])
     
-    print(f"[DEBUG] FFmpeg command: {' '.join(ffmpeg_cmd)}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("FFmpeg command: %s", ' '.join(ffmpeg_cmd))
     
     try:
-        process = await asyncio.create_subprocess_exec(
-            *ffmpeg_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        
-        stdout, stderr = await process.communicate()
+        returncode, _, stderr_text = await _run_ffmpeg_command(ffmpeg_cmd)
         
-        stderr_text = stderr.decode()
-        
-        if process.returncode != 0:
-            print(f"[ERROR] FFmpeg stderr: {stderr_text}")
-            raise VideoProcessingError(f"FFmpeg failed with exit code {process.returncode}: {stderr_text}")
+        if returncode != 0:
+            logger.error("FFmpeg stderr: %s", stderr_text)
+            raise VideoProcessingError(f"FFmpeg failed with exit code {returncode}: {stderr_text}")
         
-        if not os.path.exists(output_path):
+        if not await asyncio.to_thread(os.path.exists, output_path):
             raise VideoProcessingError("FFmpeg completed but output file was not created")
         
         print(f"[SUCCESS] Video processed successfully: {output_path}")
@@ -694,6 +1150,176 @@ async def process_video(
         
     except subprocess.SubprocessError as e:
         raise VideoProcessingError(f"Failed to execute FFmpeg: {str(e)}")
+    finally:
+        await cleanup_files_async(drawtext_files)
+
+
+def _job_float(job: Dict[str, Any], key: str, default: float) -> float:
+    """Float field of a batch job; missing or None means default (0 stays a valid value)."""
+    value = job.get(key)
+    return default if value is None else float(value)
+
+
+async def process_video_batch(
+    input_path: str,
+    jobs: List[Dict[str, Any]]
+) -> bool:
+    """
+    Render several edits of one source in a single FFmpeg run.
+
+    The input is demuxed and decoded once and the decoded frames are split into one
+    filter chain and encoder per job, instead of paying a full decode per render
+    (e.g. a preview plus the final export, or several segment exports).
+
+    Each job dict supports:
+    - output_path: where to write this render (required)
+    - trim_start / trim_duration: time range of the source to keep
+    - brightness / contrast / saturation: eq adjustment
+    - text_overlays / logo_overlays / logo_files / logo_file_sequence: as in process_video
+    - source_audio_volume: original audio volume multiplier (0-2), 0 drops the audio
+
+    Music tracks are not supported here; use process_video for renders that mix music.
+
+    Returns:
+        True if every output was written
+
+    Raises:
+        VideoProcessingError: If FFmpeg fails
+    """
+    if not await asyncio.to_thread(os.path.exists, input_path):
+        raise VideoProcessingError(f"Input file not found: {input_path}")
+    if not jobs:
+        raise VideoProcessingError("No jobs provided")
+    if any(not job.get("output_path") for job in jobs):
+        raise VideoProcessingError("Every job needs an output_path")
+
+    video_info, video_encoder = await asyncio.gather(
+        get_video_info(input_path),
+        _select_video_encoder(),
+    )
+    video_width = video_info['video']['width']
+    video_height = video_info['video']['height']
+    source_duration = float(video_info.get('duration', 0) or 0)
+    has_source_audio = bool(video_info.get('has_audio'))
+
+    # Seek the shared input to the earliest trim; each job trims relative to that point.
+    input_seek = min(max(0.0, float(job.get("trim_start", 0.0) or 0.0)) for job in jobs)
+
+    job_count = len(jobs)
+    filter_parts: List[str] = [
+        f"[0:v]split={job_count}" + ''.join(f"[src{idx}]" for idx in range(job_count))
+    ]
+    additional_inputs: List[str] = []
+    audio_jobs: List[int] = []
+    job_durations: List[Optional[float]] = []
+    job_audio_volumes: List[float] = []
+
+    drawtext_files: List[str] = []
+    try:
+        for idx, job in enumerate(jobs):
+            trim_start = max(0.0, float(job.get("trim_start", 0.0) or 0.0))
+            trim_duration = job.get("trim_duration")
+            output_duration = float(trim_duration) if trim_duration is not None else None
+            if output_duration is None and source_duration > 0:
+                output_duration = max(0.0, source_duration - trim_start)
+            if output_duration is not None and output_duration <= 0:
+                raise VideoProcessingError(f"Job {idx}: trim duration is 0 after applying trim start/time range")
+            job_durations.append(output_duration)
+
+            trim_args = f"start={trim_start - input_seek}"
+            if output_duration is not None:
+                trim_args += f":duration={output_duration}"
+            filter_parts.append(f"[src{idx}]trim={trim_args},setpts=PTS-STARTPTS[trim{idx}]")
+
+            # In a worker thread, as in process_video: it stats logo files and writes text files.
+            job_filter, job_inputs = await asyncio.to_thread(
+                build_overlay_filter,
+                trim_start=trim_start,
+                text_overlays=job.get("text_overlays") or [],
+                logo_overlays=job.get("logo_overlays") or [],
+                logo_files=job.get("logo_files") or {},
+                logo_file_sequence=job.get("logo_file_sequence") or [],
+                video_width=video_width,
+                video_height=video_height,
+                brightness=_job_float(job, "brightness", 0.0),
+                contrast=_job_float(job, "contrast", 1.0),
+                saturation=_job_float(job, "saturation", 1.0),
+                hw_upload=video_encoder == 'h264_vaapi',
+                input_pix_fmt=video_info['video'].get('pix_fmt'),
+                source_label=f"trim{idx}",
+                label_prefix=f"j{idx}",
+                logo_input_offset=1 + len(additional_inputs) // 2,
+                output_label=f"outv{idx}",
+                drawtext_files=drawtext_files
+            )
+            filter_parts.append(job_filter)
+            additional_inputs.extend(job_inputs)
+
+            bounded_volume = max(0.0, min(_job_float(job, "source_audio_volume", 1.0), 2.0))
+            job_audio_volumes.append(bounded_volume)
+            if has_source_audio and bounded_volume > 0.001:
+                audio_jobs.append(idx)
+
+        if audio_jobs:
+            filter_parts.append(
+                f"[0:a]asplit={len(audio_jobs)}" + ''.join(f"[asrc{idx}]" for idx in audio_jobs)
+            )
+            for idx in audio_jobs:
+                job_trim_start = max(0.0, float(jobs[idx].get("trim_start", 0.0) or 0.0))
+                atrim_args = f"start={job_trim_start - input_seek}"
+                if job_durations[idx] is not None:
+                    atrim_args += f":duration={job_durations[idx]}"
+                filter_parts.append(
+                    f"[asrc{idx}]atrim={atrim_args},asetpts=PTS-STARTPTS,"
+                    f"volume={job_audio_volumes[idx]},aresample=async=1[outa{idx}]"
+                )
+
+        ffmpeg_cmd = [
+            FFMPEG_BIN,
+            *_hw_device_args(video_encoder),
+            '-ss', str(input_seek),
+            '-i', input_path,
+            *additional_inputs,
+            '-filter_complex', ';'.join(filter_parts),
+        ]
+
+        for idx, job in enumerate(jobs):
+            ffmpeg_cmd.extend(['-map', f'[outv{idx}]'])
+            if idx in audio_jobs:
+                ffmpeg_cmd.extend(['-map', f'[outa{idx}]', '-c:a', 'aac', '-b:a', '192k'])
+            else:
+                ffmpeg_cmd.append('-an')
+            ffmpeg_cmd.extend([
+                *_video_encoder_args(video_encoder),
+                '-threads', str(FFMPEG_THREADS),
+                '-movflags', '+faststart',
+                '-y',
+                job["output_path"]
+            ])
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("FFmpeg batch command: %s", ' '.join(ffmpeg_cmd))
+
+        try:
+            returncode, _, stderr_text = await _run_ffmpeg_command(ffmpeg_cmd)
+
+            if returncode != 0:
+                logger.error("FFmpeg stderr: %s", stderr_text)
+                raise VideoProcessingError(f"FFmpeg failed with exit code {returncode}: {stderr_text}")
+
+            output_paths = [job["output_path"] for job in jobs]
+            existing_outputs = await asyncio.to_thread(_existing_paths, output_paths)
+            missing = [path for path in output_paths if path not in existing_outputs]
+            if missing:
+                raise VideoProcessingError(f"FFmpeg completed but outputs were not created: {missing}")
+
+            logger.info("Batch of %d videos processed from %s", job_count, input_path)
+            return True
+
+        except subprocess.SubprocessError as e:
+            raise VideoProcessingError(f"Failed to execute FFmpeg: {str(e)}")
+    finally:
+        await cleanup_files_async(drawtext_files)
 
 
 
@@ -721,7 +1347,7 @@ async def compress_video(
         raise VideoProcessingError(f"Input file not found: {input_path}")
     
     ffmpeg_cmd = [
-        'ffmpeg',
+        FFMPEG_BIN,
         '-ss', str(trim_start),
     ]
     if trim_duration is not None:
@@ -738,20 +1364,16 @@ async def compress_video(
         '-vf', 'scale=-2:720',  # Scale to 720p height, even width
         '-c:a', 'aac',
         '-b:a', '128k',
+        '-threads', str(FFMPEG_THREADS),
         '-movflags', '+faststart',
         '-y', output_path
     ]
     
     try:
-        process = await asyncio.create_subprocess_exec(
-            *ffmpeg_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await process.communicate()
+        returncode, _, stderr = await _run_ffmpeg_command(ffmpeg_cmd)
         
-        if process.returncode != 0:
-            raise VideoProcessingError(f"Compression failed: {stderr.decode()}")
+        if returncode != 0:
+            raise VideoProcessingError(f"Compression failed: {stderr}")
         
         if not os.path.exists(output_path):
             raise VideoProcessingError("Compression completed but no output file")
@@ -785,7 +1407,7 @@ async def extract_audio(
         raise VideoProcessingError("Input video has no audio track")
     
     ffmpeg_cmd = [
-        'ffmpeg',
+        FFMPEG_BIN,
         '-i', input_path,
         '-vn',  # No video
         '-acodec', 'copy',  # Copy audio without re-encoding
@@ -793,15 +1415,10 @@ async def extract_audio(
     ]
     
     try:
-        process = await asyncio.create_subprocess_exec(
-            *ffmpeg_cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await process.communicate()
+        returncode, _, stderr = await _run_ffmpeg_command(ffmpeg_cmd, limit=False)
         
-        if process.returncode != 0:
-            raise VideoProcessingError(f"Audio extraction failed: {stderr.decode()}")
+        if returncode != 0:
+            raise VideoProcessingError(f"Audio extraction failed: {stderr}")
         
         if not os.path.exists(output_path):
             raise VideoProcessingError("Audio extraction completed but no output file")
@@ -852,7 +1469,7 @@ async def merge_audio_tracks(
     if not normalized_tracks:
         raise VideoProcessingError("No valid audio tracks provided")
 
-    ffmpeg_cmd = ["ffmpeg"]
+    ffmpeg_cmd = [FFMPEG_BIN]
     for track in normalized_tracks:
         ffmpeg_cmd.extend(["-i", track["path"]])
 
@@ -944,7 +1561,7 @@ async def generate_gif(
     
     # Single pass GIF generation (more reliable)
     ffmpeg_cmd = [
-        'ffmpeg',
+        FFMPEG_BIN,
         '-ss', str(start_time),
     ]
     if duration is not None:
@@ -954,21 +1571,16 @@ async def generate_gif(
         '-i', input_path,
         '-vf', f"fps=10,scale={width}:-1:flags=lanczos",
         '-t', str(duration or 10),
+        '-threads', str(FFMPEG_THREADS),
         '-y', output_path
     ]
     
      
     try:
-        process = await asyncio.create_subprocess_exec(
-            *ffmpeg_cmd,
-            stdout=asyncio.subprocess.PIPE,
-
-            stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await process.communicate()
+        returncode, _, stderr = await _run_ffmpeg_command(ffmpeg_cmd)
          
-        if process.returncode != 0:
-            raise VideoProcessingError(f"GIF generation failed: {stderr.decode()}")
+        if returncode != 0:
+            raise VideoProcessingError(f"GIF generation failed: {stderr}")
         
         if not os.path.exists(output_path):
             raise VideoProcessingError("GIF generation completed but no output file")
@@ -996,6 +1608,16 @@ def cleanup_files(file_paths: List[str]) -> None:
         cleanup_file(path)
 
 
+async def cleanup_files_async(file_paths: List[str]) -> None:
+    """Delete multiple files in one worker-thread call, keeping stat/unlink off the event loop"""
+    await asyncio.to_thread(cleanup_files, list(file_paths))
+
+
+def _existing_paths(paths: List[str]) -> set:
+    """Subset of paths that exist, checked in a single pass"""
+    return {path for path in paths if os.path.exists(path)}
+
+
 async def create_video_from_images(
     image_paths: List[str],
     durations: List[float],
@@ -1054,7 +1676,7 @@ async def create_video_from_images(
             # Scale to fit, pad to fill 1920x1080.
             # -pix_fmt yuv420p is required for compatibility with many web players.
             ffmpeg_cmd = [
-                'ffmpeg',
+                FFMPEG_BIN,
                 '-loop', '1',
                 '-framerate', '30',
                 '-t', str(duration),
@@ -1069,6 +1691,7 @@ async def create_video_from_images(
                 '-c:a', 'aac',
                 '-ac', '2',
                 '-ar', '44100',
+                '-threads', str(FFMPEG_THREADS),
                 '-y',
                 clip_path
             ]
@@ -1084,7 +1707,7 @@ async def create_video_from_images(
 
         # Concat the clips
         ffmpeg_cmd = [
-            'ffmpeg',
+            FFMPEG_BIN,
             '-f', 'concat',
             '-safe', '0',
             '-i', concat_list_path,
@@ -1093,7 +1716,7 @@ async def create_video_from_images(
             output_path
         ]
         
-        returncode, stdout, stderr = await _run_ffmpeg_command(ffmpeg_cmd)
+        returncode, stdout, stderr = await _run_ffmpeg_command(ffmpeg_cmd, limit=False)
         
         cleanup_file(concat_list_path)
 
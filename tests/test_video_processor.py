@@ -0,0 +1,50 @@
+import unittest
+from unittest import mock
+
+from services import video_processor
+
+
+class _FakeProcess:
+    def __init__(self, stdout: bytes, returncode: int = 0):
+        self._stdout = stdout
+        self.returncode = returncode
+
+    async def communicate(self):
+        return self._stdout, b''
+
+
+class FindKeyframeBeforeTests(unittest.IsolatedAsyncioTestCase):
+    async def _find(self, ffprobe_stdout: bytes, time_point: float, start_time: float):
+        calls = []
+
+        async def fake_exec(*command, **kwargs):
+            calls.append(command)
+            return _FakeProcess(ffprobe_stdout)
+
+        with mock.patch.object(video_processor.asyncio, 'create_subprocess_exec', fake_exec):
+            result = await video_processor._find_keyframe_before('in.ts', time_point, start_time)
+        return result, calls[0]
+
+    async def test_non_zero_start_time_maps_back_to_ss_timeline(self):
+        # MPEG-TS style input: stream timestamps start at 1.4 s.
+        result, command = await self._find(b"1.400000\n3.402000\n", time_point=2.05, start_time=1.4)
+
+        self.assertEqual(result, 2.002)
+        read_intervals = command[command.index('-read_intervals') + 1]
+        self.assertTrue(read_intervals.endswith('%3.451000'), read_intervals)
+
+    async def test_ignores_keyframes_after_time_point(self):
+        result, _ = await self._find(b"1.400000\n3.402000\n4.000000,\n", time_point=2.0, start_time=1.4)
+
+        self.assertEqual(result, 0.0)
+
+    async def test_ffprobe_failure_returns_none(self):
+        async def fake_exec(*command, **kwargs):
+            return _FakeProcess(b'', returncode=1)
+
+        with mock.patch.object(video_processor.asyncio, 'create_subprocess_exec', fake_exec):
+            self.assertIsNone(await video_processor._find_keyframe_before('in.ts', 2.0, 1.4))
+
+
+if __name__ == '__main__':
+    unittest.main()